@@ -1,41 +1,61 @@
 import random
+import re
+import sys
+
+_INT_RE = re.compile(r"\s*[+-]?\d+\s*$")
+
+
+def _parse_guess(text):
+    if not _INT_RE.match(text):
+        return None
+    try:
+        return int(text)
+    except ValueError:  # e.g. more digits than sys.get_int_max_str_digits()
+        return None
+
 
 def startguessing(start, end):
     secret = random.randint(start, end)
     attempts = 0
+    write = sys.stdout.write
     
-    print(f"I've thought of a number between {start} and {end}.")
-    print("Try to guess it!")
+    write(f"I've thought of a number between {start} and {end}.\n")
+    write("Try to guess it!\n")
     
     while True:
         attempts += 1
-        user_input = input(f"Attempt {attempts}: Enter your guess: ")
+        write(f"Attempt {attempts}: Enter your guess: ")
+        sys.stdout.flush()
+        line = sys.stdin.readline()
         
+        if not line:
+            write(f"\nQuitting the game. The number was {secret}\n")
+            break
+        
+        user_input = line.rstrip("\r\n")
         if not user_input:
-            print("Empty input, try again!")
+            write("Empty input, try again!\n")
             attempts -= 1
             continue
         
-        try:
-            guess = int(user_input)
-        except ValueError:
-            print("Invalid input. Please enter a whole number.")
+        guess = _parse_guess(user_input)
+        if guess is None:
+            write("Invalid input. Please enter a whole number.\n")
             attempts -= 1
             continue
-        except EOFError:
-            print(f"Quitting the game. The number was {secret}")
-            break
         
         if guess < start or guess > end:
-            print(f"Please guess a number between {start} and {end}.")
+            write(f"Please guess a number between {start} and {end}.\n")
             attempts -= 1
         elif guess < secret:
-            print(f"Too low! ({guess})")
+            write(f"Too low! ({guess})\n")
         elif guess > secret:
-            print(f"Too high! ({guess})")
+            write(f"Too high! ({guess})\n")
         else:
-            print(f"Congratulations! You guessed the number {secret} correctly in {attempts} attempts! 🎉")
+            write(f"Congratulations! You guessed the number {secret} correctly in {attempts} attempts! 🎉\n")
             break
+    
+    sys.stdout.flush()
 
 def main():
     startguessing(1, 100)
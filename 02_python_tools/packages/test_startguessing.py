@@ -0,0 +1,45 @@
+import io
+
+import pytest
+
+from nsn_fancy_pack import main
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setattr(main.random, "randint", lambda start, end: 7)
+
+
+def play(monkeypatch, capsys, *lines):
+    monkeypatch.setattr(main.sys, "stdin", io.StringIO("".join(lines)))
+    main.startguessing(1, 10)
+    return capsys.readouterr().out
+
+
+def test_correct_guess(monkeypatch, capsys):
+    out = play(monkeypatch, capsys, "3\n", "9\n", "7\n")
+
+    assert "Too low! (3)" in out
+    assert "Too high! (9)" in out
+    assert "guessed the number 7 correctly in 3 attempts" in out
+
+
+def test_invalid_and_empty_input_do_not_count(monkeypatch, capsys):
+    out = play(monkeypatch, capsys, "abc\n", "\n", "1" * 5000 + "\n", "7\n")
+
+    assert out.count("Invalid input. Please enter a whole number.") == 2
+    assert "Empty input, try again!" in out
+    assert "correctly in 1 attempts" in out
+
+
+def test_out_of_range_guess(monkeypatch, capsys):
+    out = play(monkeypatch, capsys, "11\n", "7\n")
+
+    assert "Please guess a number between 1 and 10." in out
+    assert "correctly in 1 attempts" in out
+
+
+def test_eof_quits_and_reveals_number(monkeypatch, capsys):
+    out = play(monkeypatch, capsys, "3\n")
+
+    assert out.endswith("Quitting the game. The number was 7\n")
@@ -4,7 +4,14 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     app_name: str = "FastAPI Template"
     database_url: str = "sqlite+aiosqlite:///./app.db"
-    debug: bool = True
+    debug: bool = False
+    create_tables_on_startup: bool = True
+    sql_echo: bool = False
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_recycle: int = 3600
+    db_pgbouncer: bool = False
+    products_cache_control: str = "no-cache"
 
     class Config:
         env_file = ".env"
@@ -1,13 +1,49 @@
-from sqlalchemy import Column, Float, Integer, String
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from uuid import uuid4
+
+from sqlalchemy import Column, Float, Integer, String, make_url
+from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
+                                    create_async_engine)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from config import settings
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
-AsyncSessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
+url = make_url(settings.database_url)
+
+if settings.db_pgbouncer:
+    if url.get_driver_name() != "asyncpg":
+        raise ValueError("DB_PGBOUNCER requires a postgresql+asyncpg:// URL")
+    # PgBouncer in transaction mode can hand each transaction a different
+    # server connection, so asyncpg's statement caches are disabled and
+    # prepared statements get globally unique names. PgBouncer does the
+    # pooling, so SQLAlchemy keeps no connections of its own.
+    engine_kwargs = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+elif url.get_backend_name() != "sqlite":
+    engine_kwargs = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+else:
+    # SQLite URLs may use StaticPool (in-memory databases), which rejects
+    # the QueuePool sizing arguments.
+    engine_kwargs = {}
+
+engine = create_async_engine(
+    settings.database_url,
+    echo=settings.sql_echo,
+    **engine_kwargs,
+)
+AsyncSessionLocal = async_sessionmaker(
+    engine, expire_on_commit=False, autoflush=False, class_=AsyncSession
 )
 
 Base = declarative_base()
@@ -1,14 +1,16 @@
+import hashlib
 from contextlib import asynccontextmanager
 from typing import List, Optional
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from sqlalchemy import select
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
-from database import Product, create_tables, get_db
+from database import Product, create_tables, engine, get_db, url
 
 
 class ProductDTO(BaseModel):
@@ -44,13 +46,42 @@ class ProductResponse(BaseModel):
         from_attributes = True
 
 
+# Serializes the product list for get_products, which returns its own
+# Response so it can set caching headers. This does the same work that
+# response_model would; it is not a speed-up.
+PRODUCTS_ADAPTER = TypeAdapter(List[ProductResponse])
+
+
+def cached_json_response(request: Request, content) -> Response:
+    response = ORJSONResponse(content)
+    etag = f'"{hashlib.sha1(response.body).hexdigest()}"'
+    headers = {"Cache-Control": settings.products_cache_control, "ETag": etag}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
+    if "*" in client_etags or etag in client_etags:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return response
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await create_tables()
+    if settings.create_tables_on_startup:
+        await create_tables()
     yield
+    await engine.dispose()
 
 
-app = FastAPI(title=settings.app_name, lifespan=lifespan)
+app = FastAPI(
+    title=settings.app_name,
+    debug=settings.debug,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -71,49 +102,68 @@ async def create_product(product: ProductCreate, db: AsyncSession = Depends(get_
     )
     db.add(db_product)
     await db.commit()
-    await db.refresh(db_product)
     return db_product
 
 
 @app.get("/products/", response_model=List[ProductResponse])
-async def get_products(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Product))
-    products = result.scalars().all()
-    return products
+async def get_products(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await db.execute(
+        select(Product).order_by(Product.id).limit(limit).offset(offset)
+    )
+    products = PRODUCTS_ADAPTER.validate_python(
+        result.scalars().all(), from_attributes=True
+    )
+    return cached_json_response(
+        request, PRODUCTS_ADAPTER.dump_python(products, mode="json")
+    )
 
 
 @app.get("/products/{product_id}", response_model=ProductResponse)
-async def get_product(product_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Product).filter(Product.id == product_id))
-    product = result.scalar_one_or_none()
+async def get_product(
+    product_id: int, request: Request, db: AsyncSession = Depends(get_db)
+):
+    product = await db.get(Product, product_id)
     
     if product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    return product
+    content = ProductResponse.model_validate(product).model_dump(mode="json")
+    return cached_json_response(request, content)
 
 
 @app.put("/products/{product_id}", response_model=ProductResponse)
 async def update_product(product_id: int, product_update: ProductUpdate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Product).filter(Product.id == product_id))
-    product = result.scalar_one_or_none()
+    update_data = product_update.model_dump(exclude_unset=True)
+    # UPDATE ... RETURNING needs SQLite 3.35+; otherwise go through the ORM.
+    if update_data and db.bind.dialect.update_returning:
+        result = await db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(**update_data)
+            .returning(Product)
+        )
+        product = result.scalar_one_or_none()
+    else:
+        product = await db.get(Product, product_id)
+        if product is not None:
+            for field, value in update_data.items():
+                setattr(product, field, value)
     
     if product is None:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    update_data = product_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(product, field, value)
-    
     await db.commit()
-    await db.refresh(product)
     return product
 
 
 @app.delete("/products/{product_id}")
 async def delete_product(product_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Product).filter(Product.id == product_id))
-    product = result.scalar_one_or_none()
+    product = await db.get(Product, product_id)
     
     if product is None:
         raise HTTPException(status_code=404, detail="Product not found")
@@ -124,6 +174,28 @@ async def delete_product(product_id: int, db: AsyncSession = Depends(get_db)):
 
 
 if __name__ == "__main__":
+    import asyncio
+    import os
+
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    async def init_db():
+        await create_tables()
+        await engine.dispose()
+
+    # Create the tables once here: create_all is not atomic, so workers
+    # doing it concurrently on a fresh database fail on startup.
+    asyncio.run(init_db())
+    os.environ["CREATE_TABLES_ON_STARTUP"] = "false"
+
+    # SQLite copes badly with writers in several processes.
+    sqlite = url.get_backend_name() == "sqlite"
+
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="httptools",
+        workers=1 if sqlite else os.cpu_count(),
+    )
@@ -0,0 +1,129 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+# The engine is created when main is imported, so the in-memory database URL
+# has to be in place before the client fixture imports it.
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
+
+
+@pytest.fixture
+def client():
+    from main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def product_id(client):
+    response = client.post(
+        "/products/", json={"name": "Lamp", "price": 19.5, "stock": 3}
+    )
+    return response.json()["id"]
+
+
+@pytest.mark.parametrize("path", ["/products/", "/products/{id}"])
+def test_product_reads_send_etag(client, product_id, path):
+    response = client.get(path.format(id=product_id))
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == "no-cache"
+
+
+@pytest.mark.parametrize("path", ["/products/", "/products/{id}"])
+def test_matching_etag_returns_304(client, product_id, path):
+    path = path.format(id=product_id)
+    etag = client.get(path).headers["etag"]
+
+    for if_none_match in [etag, f"W/{etag}", f'"other", {etag}', "*"]:
+        response = client.get(path, headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+
+def test_stale_etag_returns_200(client, product_id):
+    response = client.get(
+        f"/products/{product_id}", headers={"If-None-Match": '"stale"'}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Lamp"
+
+
+def test_update_changes_etag(client, product_id):
+    path = f"/products/{product_id}"
+    etag = client.get(path).headers["etag"]
+
+    client.put(path, json={"stock": 7})
+    response = client.get(path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["stock"] == 7
+
+
+@pytest.fixture(params=[True, False], ids=["returning", "orm"])
+def update_returning(request, monkeypatch):
+    from database import engine
+
+    monkeypatch.setattr(engine.dialect, "update_returning", request.param)
+
+
+def test_partial_update_returns_product(client, product_id, update_returning):
+    response = client.put(f"/products/{product_id}", json={"price": 25.0})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": product_id,
+        "name": "Lamp",
+        "price": 25.0,
+        "description": None,
+        "stock": 3,
+    }
+    assert client.get(f"/products/{product_id}").json()["price"] == 25.0
+
+
+def test_empty_update_returns_product_unchanged(client, product_id):
+    response = client.put(f"/products/{product_id}", json={})
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Lamp"
+
+
+@pytest.mark.parametrize("body", [{}, {"stock": 1}])
+def test_update_missing_product_returns_404(client, update_returning, body):
+    response = client.put("/products/999", json=body)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "params", [{"limit": 0}, {"limit": 501}, {"offset": -1}]
+)
+def test_invalid_paging_params_return_422(client, params):
+    assert client.get("/products/", params=params).status_code == 422
+
+
+def test_products_are_paged_in_id_order(client):
+    ids = [
+        client.post(
+            "/products/", json={"name": f"P{i}", "price": 1.0, "stock": 1}
+        ).json()["id"]
+        for i in range(5)
+    ]
+
+    def page(limit, offset):
+        response = client.get(
+            "/products/", params={"limit": limit, "offset": offset}
+        )
+        return [product["id"] for product in response.json()]
+
+    assert page(limit=500, offset=0) == sorted(ids)
+    assert page(limit=2, offset=0) == ids[:2]
+    assert page(limit=2, offset=2) == ids[2:4]
+    assert page(limit=2, offset=4) == ids[4:]
+    assert page(limit=2, offset=5) == []
@@ -15,6 +15,7 @@ import {
 } from 'lucide-react';
 
 const API_URL = 'http://localhost:8000';
+const PAGE_SIZE = 500;
 
 function App() {
   const [products, setProducts] = useState([]);
@@ -33,8 +34,16 @@ function App() {
 
   const fetchProducts = async () => {
     try {
-      const response = await axios.get(`${API_URL}/products/`);
-      setProducts(response.data);
+      const allProducts = [];
+      let page;
+      do {
+        const response = await axios.get(`${API_URL}/products/`, {
+          params: { limit: PAGE_SIZE, offset: allProducts.length }
+        });
+        page = response.data;
+        allProducts.push(...page);
+      } while (page.length === PAGE_SIZE);
+      setProducts(allProducts);
     } catch (error) {
       console.error('Error fetching products:', error);
     }
@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react'
 import { Eye, Edit, Trash2, Search, Plus, X } from 'lucide-react'
 
 const API_BASE_URL = 'http://localhost:8000'
+const PAGE_SIZE = 500
 
 function AddProductDialog({ isOpen, onClose, onSuccess }) {
   const [formData, setFormData] = useState({
@@ -483,12 +484,19 @@ function App() {
   const fetchProducts = async () => {
     try {
       setLoading(true)
-      const response = await fetch(`${API_BASE_URL}/products/`)
-      if (!response.ok) {
-        throw new Error('Failed to fetch products')
-      }
-      const data = await response.json()
-      setProducts(data)
+      const allProducts = []
+      let page
+      do {
+        const response = await fetch(
+          `${API_BASE_URL}/products/?limit=${PAGE_SIZE}&offset=${allProducts.length}`
+        )
+        if (!response.ok) {
+          throw new Error('Failed to fetch products')
+        }
+        page = await response.json()
+        allProducts.push(...page)
+      } while (page.length === PAGE_SIZE)
+      setProducts(allProducts)
       setError(null)
     } catch (err) {
       setError(err.message)